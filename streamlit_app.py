@@ -2,27 +2,56 @@
 
 import streamlit as st
 
+import numpy as np
 import pandas as pd
 from snowflake.snowpark.context import get_active_session
 from snowflake.snowpark.exceptions import SnowparkSQLException
-from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import functools
+import gzip
+import hashlib
+import importlib.util
 import logging
+import pathlib
+import tempfile
+import uuid
 import re
 import os
 from typing import Dict, List, Tuple, Optional
 
-# Check for Excel support
-try:
-    import openpyxl
-    EXCEL_SUPPORT = True
-except ImportError:
-    EXCEL_SUPPORT = False
+# Check for Excel support: capability probes only, the engines themselves
+# import lazily on first use so cold starts don't pay for them
+EXCEL_SUPPORT = importlib.util.find_spec('openpyxl') is not None
+XLS_SUPPORT = importlib.util.find_spec('xlrd') is not None
+
+_openpyxl = None
+_xlrd = None
+
+def _get_openpyxl():
+    """Import openpyxl on first use and cache the module reference."""
+    global _openpyxl
+    if _openpyxl is None:
+        import openpyxl
+        _openpyxl = openpyxl
+    return _openpyxl
 
+def _get_xlrd():
+    """Import xlrd on first use and cache the module reference."""
+    global _xlrd
+    if _xlrd is None:
+        import xlrd
+        _xlrd = xlrd
+    return _xlrd
+
+# Check for pyarrow (faster CSV parsing when available)
 try:
-    import xlrd
-    XLS_SUPPORT = True
+    import pyarrow
+    import pyarrow.csv as pa_csv
+    PYARROW_SUPPORT = True
+    ZSTD_SUPPORT = pyarrow.Codec.is_available('zstd')
 except ImportError:
-    XLS_SUPPORT = False
+    PYARROW_SUPPORT = False
+    ZSTD_SUPPORT = False
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -36,22 +65,18 @@ SUPPORTED_FILE_TYPES = {
 
 # Add Excel support only if packages are available
 if EXCEL_SUPPORT or XLS_SUPPORT:
-    excel_extensions = []
-    excel_desc = "Excel Files ("
-    
-    if EXCEL_SUPPORT:
-        excel_extensions.append(".xlsx")
-        excel_desc += ".xlsx"
-    
-    if XLS_SUPPORT:
-        if excel_extensions:
-            excel_extensions.append(", .xls")
-        else:
-            excel_extensions.append(".xls")
-        excel_desc += ".xls"
-    
-    excel_desc += ")"
-    SUPPORTED_FILE_TYPES["excel"] = {"extensions": excel_extensions, "description": excel_desc}
+    excel_extensions = ([".xlsx"] if EXCEL_SUPPORT else []) + ([".xls"] if XLS_SUPPORT else [])
+    SUPPORTED_FILE_TYPES["excel"] = {
+        "extensions": excel_extensions,
+        "description": f"Excel Files ({', '.join(excel_extensions)})"
+    }
+
+# Extension -> file type lookup, inverted once so get_file_type is a dict hit
+_EXT_TO_TYPE = {ext: file_type for file_type, config in SUPPORTED_FILE_TYPES.items() for ext in config["extensions"]}
+
+# Flat tuple of allowed extensions (without dots) for st.file_uploader,
+# computed once instead of on every rerun
+SUPPORTED_EXTENSIONS = tuple(ext.lstrip('.') for config in SUPPORTED_FILE_TYPES.values() for ext in config["extensions"])
 
 DEFAULT_CSV_OPTIONS = {
     "field_delimiter": ",",
@@ -61,85 +86,603 @@ DEFAULT_CSV_OPTIONS = {
     "trim_space": True
 }
 
+# Rows per chunk when streaming CSV/TXT files (256-512k rows is the sweet spot)
+DEFAULT_CHUNK_SIZE = 250_000
+
+# Bytes per block when streaming CSVs through pyarrow's reader
+PYARROW_CSV_BLOCK_SIZE = 8 << 20
+
+# Rows shown in the data preview
+PREVIEW_ROWS = 10
+
+# Files above this size upload through the Parquet stage + COPY INTO path;
+# smaller ones go through write_pandas, which has less per-call overhead
+PARQUET_COPY_MIN_BYTES = 3 * 1024 * 1024
+
+# Target in-memory size per staged Parquet file, and the parallelism of the
+# directory-wide PUT that uploads them
+STAGE_CHUNK_BYTES = 128 << 20
+STAGE_PUT_PARALLEL = 8
+
 # --- Helper Functions ---
-def clean_column_name(name: str) -> str:
-    """Converts a column name to Snowflake-friendly identifier."""
-    if not isinstance(name, str):
-        name = str(name)
-    name = name.strip()
-    name = name.upper()
-    name = re.sub(r'\s+|-', '_', name)
-    name = re.sub(r'[()\[\]{}.?/\\\'\":;,!@#$%^&*`~]', '', name)
-    
-    if name and name[0].isdigit():
-        name = '_' + name
-    
-    # Handle empty names
-    if not name:
-        name = 'UNNAMED_COLUMN'
-    
-    return name
+# Identifier-cleaning tables, built once so per-name calls stay in C
+_DELETE_TBL = str.maketrans('', '', '()[]{}.?/\\\'":;,!@#$%^&*`~')
+_WS_DASH_RE = re.compile(r'[\s-]+')
+_ALREADY_CLEAN_RE = re.compile(r'^[A-Z_][A-Z0-9_]*$')
+
+# 256-entry table mapping every byte outside [A-Z0-9_] to '_', so table-name
+# cleaning is a single C-level lookup pass instead of a regex walk
+_TABLE_TRANS = bytes.maketrans(
+    bytes(range(256)),
+    bytes((b if (65 <= b <= 90) or (48 <= b <= 57) or b == 95 else ord('_')) for b in range(256))
+)
+
+def clean_columns(columns) -> List[str]:
+    """Converts a set of column labels to Snowflake-friendly identifiers."""
+    idx = pd.Index(columns).astype(str)
+    # Fast path: names from controlled sources usually arrive already clean
+    if idx.str.match(_ALREADY_CLEAN_RE).all():
+        return idx.tolist()
+    idx = (idx
+           .str.strip()
+           .str.upper()
+           .str.translate(_DELETE_TBL)
+           .str.replace(_WS_DASH_RE, '_', regex=True))
+    idx = idx.where(~idx.str[:1].str.isdigit().fillna(False), '_' + idx)
+    idx = idx.where(idx != '', 'UNNAMED_COLUMN')
+    return idx.tolist()
 
 def clean_table_name(name: str) -> str:
     """Converts a table name to Snowflake-friendly identifier."""
     if not isinstance(name, str):
         name = str(name)
-    name = name.strip()
-    name = name.upper()
-    name = re.sub(r'[^A-Z0-9_]', '_', name)
-    
+    name = name.strip().upper()
+    name = name.encode('ascii', 'replace').translate(_TABLE_TRANS).decode('ascii')
+
     if name and name[0].isdigit():
         name = '_' + name
-    
+
     if not name:
         name = 'UNNAMED_TABLE'
-    
+
     return name
 
 def get_file_type(filename: str) -> Optional[str]:
     """Determine file type based on extension."""
-    _, ext = os.path.splitext(filename.lower())
-    for file_type, config in SUPPORTED_FILE_TYPES.items():
-        if ext in config["extensions"]:
-            return file_type
+    return _EXT_TO_TYPE.get(os.path.splitext(filename)[1].lower())
+
+# Magic numbers for the Excel container formats
+_XLSX_MAGIC = b'PK\x03\x04'
+_XLS_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+
+def sniff_file_type(uploaded_file) -> Optional[str]:
+    """Determine file type from magic bytes, falling back to the extension.
+
+    Catches files renamed across formats (e.g. an .xlsx saved as .csv) that
+    would otherwise be fed to the wrong parser. The result is cached on the
+    UploadedFile so reruns don't re-check the header.
+    """
+    cached = getattr(uploaded_file, '_sniffed_type', None)
+    if cached is not None:
+        return cached
+
+    ext_type = get_file_type(uploaded_file.name)
+    head = bytes(uploaded_file.getbuffer()[:8])
+    if head[:4] == _XLSX_MAGIC:
+        container = 'xlsx'
+    elif head == _XLS_MAGIC:
+        container = 'xls'
+    else:
+        container = None
+
+    if container and 'excel' in SUPPORTED_FILE_TYPES:
+        sniffed = 'excel'
+    elif container is None and ext_type == 'excel':
+        # Not an Excel container, so parse it as delimited text
+        sniffed = 'csv'
+    else:
+        sniffed = ext_type
+
+    if sniffed != ext_type:
+        logger.warning(f"{uploaded_file.name}: extension suggests {ext_type}, contents look like {sniffed}; using {sniffed}")
+
+    uploaded_file._sniffed_type = sniffed
+    uploaded_file._sniffed_container = container
+    return sniffed
+
+def _excel_container(uploaded_file) -> Optional[str]:
+    """Resolve the Excel container format ('xlsx'/'xls'), preferring the sniffed one."""
+    container = getattr(uploaded_file, '_sniffed_container', None)
+    if container:
+        return container
+    filename = uploaded_file.name.lower()
+    if filename.endswith('.xlsx'):
+        return 'xlsx'
+    if filename.endswith('.xls'):
+        return 'xls'
     return None
 
-def read_file_to_dataframe(uploaded_file, file_type: str, csv_options: Dict = None) -> pd.DataFrame:
-    """Read uploaded file into pandas DataFrame based on file type."""
+def list_excel_sheets(uploaded_file) -> List[str]:
+    """Return the sheet names of an Excel file without loading any sheet data."""
+    container = _excel_container(uploaded_file)
+    if container == 'xlsx' and EXCEL_SUPPORT:
+        uploaded_file.seek(0)
+        wb = _get_openpyxl().load_workbook(uploaded_file, read_only=True)
+        names = wb.sheetnames
+        wb.close()
+        return names
+    if container == 'xls' and XLS_SUPPORT:
+        book = _get_xlrd().open_workbook(file_contents=uploaded_file.getvalue(), on_demand=True)
+        names = book.sheet_names()
+        book.release_resources()
+        return names
+    return []
+
+def _iter_pyarrow_csv(stream, csv_options: Dict):
+    """Stream a CSV through pyarrow's multithreaded block reader."""
+    read_options = pa_csv.ReadOptions(
+        block_size=PYARROW_CSV_BLOCK_SIZE,
+        use_threads=True,
+        autogenerate_column_names=(csv_options.get("skip_header", 1) != 1)
+    )
+    parse_options = pa_csv.ParseOptions(
+        delimiter=csv_options.get("field_delimiter", ","),
+        quote_char=csv_options.get("field_optionally_enclosed_by") or False,
+        escape_char='\\'
+    )
+    convert_options = pa_csv.ConvertOptions(
+        strings_can_be_null=bool(csv_options.get("empty_field_as_null", True))
+    )
+    # pyarrow has no trim option, so emulate TRIM_SPACE per batch to stay
+    # consistent with the pandas fallback and the raw-COPY file format
+    trim_space = bool(csv_options.get("trim_space", True))
+    with pa_csv.open_csv(stream, read_options=read_options,
+                         parse_options=parse_options,
+                         convert_options=convert_options) as reader:
+        for batch in reader:
+            if batch.num_rows:
+                df = batch.to_pandas()
+                if trim_space:
+                    for col in df.columns[df.dtypes == object]:
+                        df[col] = df[col].str.strip()
+                yield df
+
+def iter_file_chunks(uploaded_file, file_type: str, csv_options: Dict = None, chunksize: int = DEFAULT_CHUNK_SIZE, sheet_name: Optional[str] = None):
+    """Yield DataFrame chunks from an uploaded file without materializing it whole.
+
+    CSV/TXT files are streamed chunksize rows at a time so peak memory stays at
+    one chunk; Excel files are yielded as a single chunk since the engines read
+    the full sheet anyway.
+    """
     if csv_options is None:
         csv_options = DEFAULT_CSV_OPTIONS
-    
-    file_bytes = uploaded_file.getvalue()
-    file_size_mb = len(file_bytes) / 1024 / 1024
-    input_stream = BytesIO(file_bytes)
-    
-    # Show progress for larger files
+
+    # Hand the UploadedFile (already BytesIO-like) to the parsers directly
+    # instead of copying it into a second buffer; getbuffer() is a memoryview,
+    # so the size check doesn't copy either
+    file_size_mb = len(uploaded_file.getbuffer()) / 1024 / 1024
+    uploaded_file.seek(0)
+    input_stream = uploaded_file
+
+    # Note large files (logged, not st.info: this may run on a worker thread)
     if file_size_mb > 50:
-        st.info(f"📊 Processing {file_size_mb:.1f}MB file...")
-    
+        logger.info(f"Processing {file_size_mb:.1f}MB file {uploaded_file.name}")
+
     if file_type == "excel":
-        filename = uploaded_file.name.lower()
-        if filename.endswith('.xlsx') and EXCEL_SUPPORT:
-            df = pd.read_excel(input_stream, engine='openpyxl')
-        elif filename.endswith('.xls') and XLS_SUPPORT:
-            df = pd.read_excel(input_stream, engine='xlrd')
+        container = _excel_container(uploaded_file)
+        if container == 'xlsx' and EXCEL_SUPPORT:
+            # read_only streams rows instead of building the full workbook
+            # DOM, keeping memory close to the file size
+            wb = _get_openpyxl().load_workbook(input_stream, read_only=True, data_only=True)
+            ws = wb[sheet_name] if sheet_name else wb.active
+            rows = ws.iter_rows(values_only=True)
+            header = next(rows, None)
+            df = pd.DataFrame(rows, columns=header)
+            wb.close()
+        elif container == 'xls' and XLS_SUPPORT:
+            # on_demand loads only the requested sheet, not the whole workbook
+            # (xlrd needs the raw bytes, so this path still copies once)
+            book = _get_xlrd().open_workbook(file_contents=input_stream.getvalue(), on_demand=True)
+            sheet = book.sheet_by_name(sheet_name) if sheet_name else book.sheet_by_index(0)
+            values = [sheet.row_values(r) for r in range(sheet.nrows)]
+            df = pd.DataFrame(values[1:], columns=values[0] if values else None)
+            book.release_resources()
         else:
             raise ValueError("Excel file type not supported in this environment. Please add the required packages (openpyxl for .xlsx, xlrd for .xls) to your Streamlit app in Snowsight.")
+        yield df
     elif file_type in ["csv", "txt"]:
-        # Read CSV/TXT file
+        if PYARROW_SUPPORT:
+            # pyarrow parses blocks multi-threaded and streams record
+            # batches, so this path is both faster and chunked
+            yield from _iter_pyarrow_csv(input_stream, csv_options)
+        else:
+            # Force the C engine so pandas never silently falls back to the
+            # much slower Python engine
+            pandas_args = {
+                "delimiter": csv_options.get("field_delimiter", ","),
+                "header": 0 if csv_options.get("skip_header", 1) == 1 else None,
+                "quotechar": csv_options.get("field_optionally_enclosed_by", '"'),
+                "skipinitialspace": csv_options.get("trim_space", True),
+                "engine": "c",
+                "escapechar": '\\',
+                "chunksize": chunksize
+            }
+            for chunk in pd.read_csv(input_stream, **pandas_args):
+                yield chunk
+    else:
+        raise ValueError(f"Unsupported file type: {file_type}")
+
+def read_preview(uploaded_file, file_type: str, csv_options: Dict = None, sheet_name: Optional[str] = None) -> Tuple[pd.DataFrame, int, bool]:
+    """Read only the first PREVIEW_ROWS rows plus a row-count estimate.
+
+    Returns (head_df, num_rows, exact). For CSV/TXT the count is estimated
+    from bytes-per-line over a head sample, so the full parse happens exactly
+    once, during upload. Excel sheet dimensions come from the workbook
+    metadata, so those counts are exact.
+    """
+    if csv_options is None:
+        csv_options = DEFAULT_CSV_OPTIONS
+
+    file_size = len(uploaded_file.getbuffer())
+    uploaded_file.seek(0)
+
+    if file_type == "excel":
+        container = _excel_container(uploaded_file)
+        if container == 'xlsx' and EXCEL_SUPPORT:
+            wb = _get_openpyxl().load_workbook(uploaded_file, read_only=True, data_only=True)
+            ws = wb[sheet_name] if sheet_name else wb.active
+            rows = []
+            for row in ws.iter_rows(values_only=True):
+                rows.append(row)
+                if len(rows) > PREVIEW_ROWS:
+                    break
+            num_rows = max((ws.max_row or 0) - 1, 0)
+            wb.close()
+            head = pd.DataFrame(rows[1:], columns=rows[0] if rows else None)
+            return head, num_rows, True
+        if container == 'xls' and XLS_SUPPORT:
+            book = _get_xlrd().open_workbook(file_contents=uploaded_file.getvalue(), on_demand=True)
+            sheet = book.sheet_by_name(sheet_name) if sheet_name else book.sheet_by_index(0)
+            values = [sheet.row_values(r) for r in range(min(sheet.nrows, PREVIEW_ROWS + 1))]
+            num_rows = max(sheet.nrows - 1, 0)
+            book.release_resources()
+            head = pd.DataFrame(values[1:], columns=values[0] if values else None)
+            return head, num_rows, True
+        raise ValueError("Excel file type not supported in this environment. Please add the required packages (openpyxl for .xlsx, xlrd for .xls) to your Streamlit app in Snowsight.")
+
+    if file_type in ["csv", "txt"]:
         pandas_args = {
             "delimiter": csv_options.get("field_delimiter", ","),
             "header": 0 if csv_options.get("skip_header", 1) == 1 else None,
             "quotechar": csv_options.get("field_optionally_enclosed_by", '"'),
             "escapechar": '\\',
-            "skipinitialspace": csv_options.get("trim_space", True)
+            "skipinitialspace": csv_options.get("trim_space", True),
+            "engine": "c",
+            "nrows": PREVIEW_ROWS
         }
-        df = pd.read_csv(input_stream, **pandas_args)
-    else:
-        raise ValueError(f"Unsupported file type: {file_type}")
-    
+        head = pd.read_csv(uploaded_file, **pandas_args)
+        if len(head) < PREVIEW_ROWS:
+            # Fewer data rows than the preview window: the count is exact
+            return head, len(head), True
+
+        # Estimate rows from bytes-per-line over the first 64KB
+        sample = bytes(uploaded_file.getbuffer()[:65536])
+        sample_lines = sample.count(b'\n') or 1
+        if len(sample) >= file_size:
+            total_lines = sample_lines + (0 if sample.endswith(b'\n') else 1)
+            exact = True
+        else:
+            total_lines = int(file_size * sample_lines / len(sample))
+            exact = False
+        num_rows = max(total_lines - csv_options.get("skip_header", 1), len(head))
+        return head, num_rows, exact
+
+    raise ValueError(f"Unsupported file type: {file_type}")
+
+def file_digest(uploaded_file) -> str:
+    """Cheap content digest used as the cache key for parsed previews."""
+    return hashlib.blake2b(uploaded_file.getbuffer(), digest_size=16).hexdigest()
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def load_preview(digest: str, _uploaded_file, file_type: str, csv_options_items: Optional[Tuple], sheet_name: Optional[str]) -> Dict:
+    """Parse the first chunk of a file for preview, cached per (bytes, options).
+
+    The digest and option arguments form the cache key; the uploaded file
+    itself is underscore-prefixed so Streamlit does not try to hash it.
+    """
+    head, num_rows, exact = read_preview(
+        _uploaded_file,
+        file_type,
+        dict(csv_options_items) if csv_options_items else None,
+        sheet_name=sheet_name
+    )
+    return {
+        'original_columns': head.columns.tolist(),
+        'num_rows': num_rows,
+        'num_rows_exact': exact,
+        'preview_head': head
+    }
+
+# Literal strings that should load as NULL, as the old astype(str) path did
+_NULL_SENTINELS = ('<NA>', 'nan', 'NaN', 'None')
+
+def normalize_nulls(df: pd.DataFrame) -> pd.DataFrame:
+    """Map NaN and literal null sentinels to None on object columns.
+
+    Goes through category dtype so the sentinel check touches the (small)
+    categories array instead of scanning every cell of the column.
+    """
+    for c in df.select_dtypes(include='object').columns:
+        s = df[c].astype('category')
+        drop = [v for v in _NULL_SENTINELS if v in s.cat.categories]
+        if drop:
+            s = s.cat.remove_categories(drop)
+        df[c] = s.astype(object).where(s.notna(), None)
+    return df
+
+def shrink_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcast numeric columns and dictionary-encode repetitive strings.
+
+    Fewer bytes staged means a faster COPY; Snowflake still infers the final
+    column types server-side via use_logical_type.
+    """
+    for c in df.select_dtypes(include='float64').columns:
+        df[c] = pd.to_numeric(df[c], downcast='float')
+    for c in df.select_dtypes(include='int64').columns:
+        df[c] = pd.to_numeric(df[c], downcast='integer')
+    # Low-cardinality strings serialize as dictionary-encoded Parquet
+    for c in df.select_dtypes(include='object').columns:
+        if len(df) and df[c].nunique(dropna=False) / len(df) < 0.5:
+            df[c] = df[c].astype('category')
     return df
 
+@st.cache_resource
+def load_css() -> str:
+    """App stylesheet, read from disk once per server process."""
+    return pathlib.Path(__file__).with_name('style.css').read_text()
+
+@functools.lru_cache(maxsize=8)
+def connection_badges_html(database: str, schema: str, role: str, warehouse: str) -> str:
+    """Connection badges markup, formatted only when the inputs change."""
+    return f"""
+<div class="connection-badges">
+    <span class="connection-badge">Database: {database}</span>
+    <span class="connection-badge">Schema: {schema}</span>
+    <span class="connection-badge">Role: {role}</span>
+    <span class="connection-badge">Warehouse: {warehouse}</span>
+</div>
+"""
+
+@st.cache_resource
+def get_session_context(session_id: str, _session) -> Tuple[str, str, str, str]:
+    """Current database/schema/role/warehouse in one query, cached per session.
+
+    Replaces four separate get_current_* round trips on every rerun. The
+    session id is the cache key (the session object itself is unhashable),
+    so a new session gets a fresh context.
+    """
+    row = _session.sql(
+        "SELECT CURRENT_DATABASE(), CURRENT_SCHEMA(), CURRENT_ROLE(), CURRENT_WAREHOUSE()"
+    ).collect()[0]
+    return tuple((value or '').replace('"', '') for value in row)
+
+@st.cache_data(ttl=300)
+def list_databases(_session) -> List[str]:
+    """Database names visible to the session, cached for 5 minutes."""
+    return [row['name'] for row in _session.sql("SHOW DATABASES").collect()]
+
+@st.cache_data(ttl=300)
+def list_schemas(_session, database: str) -> List[str]:
+    """Schema names in a database, cached for 5 minutes."""
+    return [row['name'] for row in _session.sql(f"SHOW SCHEMAS IN DATABASE {database}").collect()]
+
+def raw_copy_eligible(config: Dict) -> bool:
+    """Whether a file can skip pandas and be COPY'd into Snowflake as-is.
+
+    Raw COPY loads the staged file untouched, so it only applies to delimited
+    files whose column names were left at the cleaned defaults.
+    """
+    return (config.get('file_type') in ('csv', 'txt')
+            and bool(config.get('cleaned_columns'))
+            and config.get('custom_columns') == config.get('cleaned_columns'))
+
+def upload_file_raw_copy(session, uploaded_file, config: Dict, database: str, schema: str) -> Tuple[str, str]:
+    """Load a CSV/TXT file via PUT + COPY INTO with no pandas round-trip.
+
+    The original bytes are gzipped locally, PUT to the user stage and COPY'd
+    with a file format built from the sidebar CSV options, so Snowflake does
+    all the parsing. Same (status, message) contract as upload_file_to_table.
+    """
+    file_name = uploaded_file.name
+    table_name = config['table_name']
+    csv_options = config.get('csv_options') or DEFAULT_CSV_OPTIONS
+    full_table_name = f"{database}.{schema}.{table_name}"
+    stage_dir = f"@~/streamlit_uploads/{uuid.uuid4().hex}"
+
+    # A header-only file would still CREATE OR REPLACE the target table;
+    # skip it before touching Snowflake, like the pandas path does
+    if config.get('num_rows') == 0 and config.get('num_rows_exact', False):
+        return 'warning', f"Skipped empty file: {file_name}"
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = os.path.join(tmp_dir, 'data.csv.gz')
+            with open(tmp_path, 'wb') as f:
+                f.write(gzip.compress(uploaded_file.getvalue(), compresslevel=1))
+            session.file.put(f"file://{tmp_path}", stage_dir, auto_compress=False, overwrite=True)
+
+        try:
+            # All-VARCHAR target table from the cleaned preview columns,
+            # matching what the pandas path used to create
+            columns_sql = ', '.join(f'"{c}" VARCHAR' for c in config['cleaned_columns'])
+            session.sql(f'CREATE OR REPLACE TABLE {full_table_name} ({columns_sql})').collect()
+
+            delimiter = csv_options.get('field_delimiter', ',')
+            if delimiter == '\t':
+                delimiter = '\\t'
+            quote = csv_options.get('field_optionally_enclosed_by')
+            quote_sql = f"FIELD_OPTIONALLY_ENCLOSED_BY='{quote.replace(chr(39), chr(39) * 2)}' " if quote else ""
+            copy_sql = (
+                f"COPY INTO {full_table_name} FROM {stage_dir} "
+                f"FILE_FORMAT=(TYPE=CSV COMPRESSION=GZIP "
+                f"FIELD_DELIMITER='{delimiter}' "
+                f"SKIP_HEADER={csv_options.get('skip_header', 1)} "
+                f"{quote_sql}"
+                f"TRIM_SPACE={'TRUE' if csv_options.get('trim_space') else 'FALSE'} "
+                f"EMPTY_FIELD_AS_NULL={'TRUE' if csv_options.get('empty_field_as_null') else 'FALSE'}) "
+                f"ON_ERROR=CONTINUE"
+            )
+            result = session.sql(copy_sql).collect()
+            total_rows = sum(int(row['rows_loaded']) for row in result) if result else 0
+        finally:
+            session.sql(f"REMOVE {stage_dir}").collect()
+
+        logger.info(f"Raw COPY loaded {total_rows} rows from {file_name} into {full_table_name}")
+        if total_rows == 0:
+            return 'warning', f"No rows loaded from {file_name}: {table_name} was created empty"
+        return 'success', f"Successfully uploaded {file_name} to {table_name} ({total_rows} rows, raw COPY)"
+
+    except SnowparkSQLException as e:
+        logger.error(f"Snowflake error for {file_name}: {e}", exc_info=True)
+        return 'error', f"Snowflake error for {file_name}: {e.message}"
+    except Exception as e:
+        logger.error(f"Error processing {file_name}: {e}", exc_info=True)
+        return 'error', f"Error processing {file_name}: {str(e)}"
+
+def _mark_columns_dirty(file_name: str):
+    """on_change callback for the column editor: forces a re-clean at upload."""
+    config = st.session_state.file_configs.get(file_name)
+    if config is not None:
+        config['custom_columns_clean'] = False
+
+def _prepare_chunk(chunk: pd.DataFrame, config: Dict) -> pd.DataFrame:
+    """Apply column names, null normalization and dtype shrinking to a chunk."""
+    # Apply custom column names if available, else the originals; names the
+    # user never edited are already clean from the preview step
+    if 'custom_columns' in config and len(config['custom_columns']) == len(chunk.columns):
+        if config.get('custom_columns_clean'):
+            chunk.columns = list(config['custom_columns'])
+        else:
+            chunk.columns = clean_columns(config['custom_columns'])
+    else:
+        chunk.columns = clean_columns(chunk.columns)
+
+    # Normalize missing values on object columns only; numeric columns
+    # upload natively without a string round-trip
+    chunk = normalize_nulls(chunk)
+
+    # Shrink dtypes so the staged Parquet ships fewer bytes
+    return shrink_dtypes(chunk)
+
+def _upload_via_write_pandas(session, uploaded_file, config: Dict, database: str, schema: str) -> int:
+    """Upload a small file chunk-by-chunk through session.write_pandas."""
+    total_rows = 0
+    for chunk in iter_file_chunks(uploaded_file, config['file_type'], config.get('csv_options'), sheet_name=config.get('sheet_name')):
+        if chunk.empty:
+            continue
+        chunk = _prepare_chunk(chunk, config)
+
+        # write_pandas stages the chunk and issues a COPY INTO instead of
+        # shipping row-by-row binds
+        session.write_pandas(
+            chunk,
+            config['table_name'],
+            database=database,
+            schema=schema,
+            chunk_size=100_000,
+            compression='snappy',
+            parallel=4,
+            use_logical_type=True,
+            auto_create_table=True,
+            overwrite=(total_rows == 0)
+        )
+        total_rows += len(chunk)
+    return total_rows
+
+def _upload_via_parquet_stage(session, uploaded_file, config: Dict, full_table_name: str) -> int:
+    """Stage prepared chunks as Parquet files and load them with one COPY INTO.
+
+    Chunks are written to local Parquet files (split so each stays around
+    STAGE_CHUNK_BYTES, since many medium files PUT faster than one big one),
+    uploaded with a single directory-wide parallel PUT, then the target table
+    is created from the staged files' inferred schema and filled with a
+    single bulk COPY.
+    """
+    stage_dir = f"@~/streamlit_uploads/{uuid.uuid4().hex}"
+    total_rows = 0
+    # zstd level 3 shrinks staged files 20-40% over snappy at similar CPU;
+    # fall back to snappy when the pyarrow build lacks the codec
+    parquet_kwargs = {'compression': 'zstd', 'compression_level': 3} if ZSTD_SUPPORT else {'compression': 'snappy'}
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            n_files = 0
+            for chunk in iter_file_chunks(uploaded_file, config['file_type'], config.get('csv_options'), sheet_name=config.get('sheet_name')):
+                if chunk.empty:
+                    continue
+                chunk = _prepare_chunk(chunk, config)
+                n_parts = max(1, int(chunk.memory_usage(deep=True).sum()) // STAGE_CHUNK_BYTES)
+                for part in (np.array_split(chunk, n_parts) if n_parts > 1 else (chunk,)):
+                    part.to_parquet(os.path.join(tmp_dir, f"chunk_{n_files:05d}.parquet"), index=False, **parquet_kwargs)
+                    n_files += 1
+                total_rows += len(chunk)
+
+            if total_rows == 0:
+                return 0
+
+            # One directory-wide PUT uploads all staged files in parallel
+            session.file.put(f"file://{tmp_dir}/*", stage_dir, auto_compress=False, overwrite=True, parallel=STAGE_PUT_PARALLEL)
+
+        # Create the target table from the staged files' schema, then bulk load
+        session.sql("CREATE TEMP FILE FORMAT IF NOT EXISTS streamlit_uploader_parquet_fmt TYPE=PARQUET").collect()
+        session.sql(
+            f"CREATE OR REPLACE TABLE {full_table_name} USING TEMPLATE ("
+            f"SELECT ARRAY_AGG(OBJECT_CONSTRUCT(*)) FROM TABLE("
+            f"INFER_SCHEMA(LOCATION=>'{stage_dir}', FILE_FORMAT=>'streamlit_uploader_parquet_fmt')))"
+        ).collect()
+        # The vectorized scanner reads the staged Parquet column-wise on the
+        # Snowflake side; it only allows ABORT_STATEMENT/SKIP_FILE for
+        # ON_ERROR, so the default ABORT_STATEMENT applies here
+        session.sql(
+            f"COPY INTO {full_table_name} FROM {stage_dir} "
+            f"FILE_FORMAT=(TYPE=PARQUET USE_VECTORIZED_SCANNER=TRUE) "
+            f"MATCH_BY_COLUMN_NAME=CASE_INSENSITIVE"
+        ).collect()
+    finally:
+        session.sql(f"REMOVE {stage_dir}").collect()
+    return total_rows
+
+def upload_file_to_table(session, uploaded_file, config: Dict, database: str, schema: str) -> Tuple[str, str]:
+    """Parse and upload one configured file, returning (status, message).
+
+    status is 'success', 'warning' or 'error'. Runs on a worker thread, so it
+    must not touch Streamlit APIs or session state; the caller renders the
+    returned message on the main thread.
+    """
+    file_name = uploaded_file.name
+    table_name = config['table_name']
+    full_table_name = f"{database}.{schema}.{table_name}"
+
+    try:
+        if PYARROW_SUPPORT and len(uploaded_file.getbuffer()) > PARQUET_COPY_MIN_BYTES:
+            total_rows = _upload_via_parquet_stage(session, uploaded_file, config, full_table_name)
+        else:
+            total_rows = _upload_via_write_pandas(session, uploaded_file, config, database, schema)
+
+        logger.info(f"Read {total_rows} rows from {file_name}")
+
+        if total_rows == 0:
+            return 'warning', f"Skipped empty file: {file_name}"
+
+        logger.info(f"Successfully uploaded {file_name} to {full_table_name}")
+        return 'success', f"Successfully uploaded {file_name} to {table_name} ({total_rows} rows)"
+
+    except SnowparkSQLException as e:
+        logger.error(f"Snowflake error for {file_name}: {e}", exc_info=True)
+        return 'error', f"Snowflake error for {file_name}: {e.message}"
+    except Exception as e:
+        logger.error(f"Error processing {file_name}: {e}", exc_info=True)
+        return 'error', f"Error processing {file_name}: {str(e)}"
+
 # --- Initialize Session State ---
 if 'file_configs' not in st.session_state:
     st.session_state.file_configs = {}
@@ -147,10 +690,7 @@ if 'file_configs' not in st.session_state:
 # --- Get Snowpark Session ---
 try:
     session = get_active_session()
-    db = session.get_current_database().replace('"', '')
-    schema = session.get_current_schema().replace('"', '')
-    role = session.get_current_role().replace('"', '')
-    warehouse = session.get_current_warehouse().replace('"', '')
+    db, schema, role, warehouse = get_session_context(session.session_id, session)
     logger.info(f"Snowpark session active. Role: {role}, DB: {db}, Schema: {schema}, WH: {warehouse}")
 except Exception as e:
     st.error(f"Error getting Snowflake session: {e}")
@@ -165,236 +705,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for modern Snowflake-themed design
-st.markdown("""
-<style>
-    .main-header {
-        text-align: center;
-        padding: 2rem 0;
-        margin-bottom: 1rem;
-        width: 100%;
-        display: flex;
-        flex-direction: column;
-        align-items: center;
-        justify-content: center;
-    }
-    
-    .main-title {
-        font-size: clamp(2rem, 5vw, 3rem);
-        font-weight: 700;
-        margin: 0;
-        background: linear-gradient(135deg, #29B5E8 0%, #1E88E5 50%, #0D47A1 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        line-height: 1.1;
-        text-align: center;
-        width: 100%;
-    }
-    
-    .subtitle {
-        font-size: clamp(1rem, 2.5vw, 1.1rem);
-        color: #64748B;
-        margin: 1rem auto 0 auto;
-        max-width: 650px;
-        line-height: 1.5;
-        text-align: center;
-        width: 100%;
-        padding: 0 2rem;
-        display: block;
-        box-sizing: border-box;
-    }
-    
-    .connection-badge {
-        display: inline-block;
-        background: #F8FAFC;
-        border: 1px solid #E2E8F0;
-        border-radius: 8px;
-        padding: 0.4rem 0.8rem;
-        margin: 0.2rem;
-        font-size: 0.8rem;
-        color: #475569;
-        white-space: nowrap;
-    }
-    
-    .connection-badges {
-        text-align: center;
-        margin: 1.5rem 0;
-        display: flex;
-        flex-wrap: wrap;
-        justify-content: center;
-        gap: 0.5rem;
-        width: 100%;
-    }
-    
-    .upload-section {
-        max-width: 900px;
-        margin: 2rem auto;
-        padding: 2rem;
-        background: white;
-        border-radius: 12px;
-        box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-        border: 1px solid #E2E8F0;
-    }
-    
-    .section-title {
-        font-size: clamp(1.2rem, 3vw, 1.4rem);
-        font-weight: 600;
-        color: #1E293B;
-        margin-bottom: 1.5rem;
-        text-align: center;
-        width: 100%;
-    }
-    
-    .stButton > button {
-        background: linear-gradient(135deg, #29B5E8 0%, #1E88E5 100%) !important;
-        color: white !important;
-        border: none !important;
-        border-radius: 8px !important;
-        padding: 0.6rem 1.5rem !important;
-        font-weight: 500 !important;
-        transition: all 0.2s !important;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-1px) !important;
-        box-shadow: 0 4px 12px rgba(41, 181, 232, 0.4) !important;
-    }
-    
-    .feature-grid {
-        display: grid;
-        grid-template-columns: repeat(4, 1fr);
-        gap: 1.5rem;
-        margin: 2rem 0;
-        padding: 0 1rem;
-        width: 100%;
-        max-width: 1200px;
-        margin-left: auto;
-        margin-right: auto;
-    }
-    
-    .feature-card {
-        background: linear-gradient(135deg, #F8FAFC 0%, #F1F5F9 100%);
-        padding: 2rem 1.5rem;
-        border-radius: 16px;
-        border: 1px solid #E2E8F0;
-        text-align: center;
-        transition: all 0.3s ease;
-        position: relative;
-        overflow: hidden;
-        min-width: 0;
-    }
-    
-    .feature-card::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        height: 3px;
-        background: linear-gradient(135deg, #29B5E8 0%, #1E88E5 100%);
-    }
-    
-    .feature-card:hover {
-        transform: translateY(-4px);
-        box-shadow: 0 8px 25px rgba(41, 181, 232, 0.15);
-        border-color: #29B5E8;
-    }
-    
-    .feature-title {
-        font-weight: 600;
-        color: #1E293B;
-        margin: 1rem 0 0.5rem 0;
-        font-size: 1.1rem;
-        text-align: center;
-        word-break: break-word;
-    }
-    
-    .feature-desc {
-        color: #64748B;
-        font-size: 0.9rem;
-        margin: 0;
-        line-height: 1.4;
-        text-align: center;
-        word-break: break-word;
-        hyphens: auto;
-    }
-    
-    .stExpander {
-        border: 1px solid #E2E8F0 !important;
-        border-radius: 12px !important;
-        margin: 1rem 0 !important;
-        background: white !important;
-    }
-    
-    .stExpander > div:first-child {
-        background: #F8FAFC !important;
-        border-radius: 12px 12px 0 0 !important;
-    }
-    
-    .stProgress .stProgress-bar {
-        background: linear-gradient(135deg, #29B5E8 0%, #1E88E5 100%) !important;
-    }
-    
-    /* Hide Streamlit elements */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    
-    .block-container {
-        padding-top: 2rem;
-        max-width: 100%;
-    }
-    
-    /* Remove any blank containers */
-    .element-container:empty {
-        display: none !important;
-    }
-    
-    /* Remove excessive spacing between main sections */
-    .main .block-container .element-container {
-        margin-bottom: 0 !important;
-    }
-    
-    /* Tight spacing for connection badges area */
-    .connection-badges + .element-container {
-        margin-top: 0 !important;
-        padding-top: 0 !important;
-    }
-    
-    /* Ensure upload section has minimal top margin */
-    .upload-section {
-        margin-top: 1rem !important;
-    }
-    
-    /* Responsive improvements */
-    @media (max-width: 1024px) {
-        .feature-grid {
-            grid-template-columns: repeat(2, 1fr);
-            gap: 1.5rem;
-            max-width: 800px;
-        }
-    }
-    
-    @media (max-width: 768px) {
-        .connection-badges {
-            flex-direction: column;
-            align-items: center;
-        }
-        
-        .feature-grid {
-            grid-template-columns: 1fr;
-            gap: 1rem;
-            max-width: 400px;
-        }
-        
-        .upload-section {
-            margin: 1rem;
-            padding: 1.5rem;
-        }
-    }
-</style>
-""", unsafe_allow_html=True)
+# Custom CSS for modern Snowflake-themed design (stylesheet loaded once per process)
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
 # Compact Excel support status
 excel_warning = None
@@ -420,11 +732,11 @@ st.markdown("""
 with st.sidebar:
     st.markdown("### Target Location")
     
-    # Get available databases and schemas
+    # Get available databases and schemas (cached so reruns skip the
+    # Snowflake round-trips)
     try:
-        databases_result = session.sql("SHOW DATABASES").collect()
-        available_databases = [row['name'] for row in databases_result]
-        
+        available_databases = list_databases(session)
+
         # Database selection
         current_db_index = available_databases.index(db) if db in available_databases else 0
         selected_db = st.selectbox(
@@ -435,9 +747,8 @@ with st.sidebar:
         )
         
         # Get schemas for selected database
-        schemas_result = session.sql(f"SHOW SCHEMAS IN DATABASE {selected_db}").collect()
-        available_schemas = [row['name'] for row in schemas_result]
-        
+        available_schemas = list_schemas(session, selected_db)
+
         # Schema selection
         current_schema_index = available_schemas.index(schema) if schema in available_schemas else 0
         selected_schema = st.selectbox(
@@ -446,7 +757,12 @@ with st.sidebar:
             index=current_schema_index,
             help="Select target schema for uploads"
         )
-        
+
+        if st.button("Refresh databases", help="Re-fetch the database and schema lists"):
+            list_databases.clear()
+            list_schemas.clear()
+            st.rerun()
+
     except Exception as e:
         st.error(f"Error fetching databases/schemas: {str(e)}")
         selected_db = db
@@ -469,17 +785,7 @@ with st.sidebar:
     }
 
 # Connection info and upload section combined
-st.markdown(f"""
-<div class="connection-badges">
-    <span class="connection-badge">Database: {selected_db}</span>
-    <span class="connection-badge">Schema: {selected_schema}</span>
-    <span class="connection-badge">Role: {role}</span>
-    <span class="connection-badge">Warehouse: {warehouse}</span>
-</div>
-""", unsafe_allow_html=True)
-
-# Build supported file extensions list (keeping it minimal)
-supported_extensions = [ext[1:] for config in SUPPORTED_FILE_TYPES.values() for ext in config['extensions']]
+st.markdown(connection_badges_html(selected_db, selected_schema, role, warehouse), unsafe_allow_html=True)
 
 # Upload section header as Streamlit component
 st.markdown('<div class="section-title" style="margin-top: 2rem;">Upload Your Files</div>', unsafe_allow_html=True)
@@ -487,7 +793,7 @@ st.markdown('<div class="section-title" style="margin-top: 2rem;">Upload Your Fi
 # File uploader immediately after title
 uploaded_files = st.file_uploader(
     "Drag and drop files here or click to browse",
-    type=supported_extensions,
+    type=list(SUPPORTED_EXTENSIONS),
     accept_multiple_files=True,
     key="universal_file_uploader",
     label_visibility="collapsed"
@@ -524,8 +830,8 @@ if uploaded_files:
     # Configure each file
     for i, uploaded_file in enumerate(uploaded_files):
         file_name = uploaded_file.name
-        file_type = get_file_type(file_name)
-        
+        file_type = sniff_file_type(uploaded_file)
+
         if not file_type:
             st.error(f"Unsupported file type: {file_name}")
             continue
@@ -539,20 +845,46 @@ if uploaded_files:
             col1, col2 = st.columns([1, 1])
             
             with col1:
-                # Table name configuration
-                default_table_name = clean_table_name(os.path.splitext(file_name)[0])
+                # Table name configuration (default computed once per file,
+                # not on every rerun)
+                if 'default_table_name' not in config:
+                    config['default_table_name'] = clean_table_name(os.path.splitext(file_name)[0])
                 table_name = st.text_input(
                     f"Table Name:",
-                    value=default_table_name,
+                    value=config['default_table_name'],
                     key=f"table_name_{i}",
                     help="Table name will be cleaned for Snowflake compatibility"
                 )
-                table_name = clean_table_name(table_name)
+                # Only re-clean when the input actually changed
+                if table_name != config.get('raw_table_name'):
+                    config['raw_table_name'] = table_name
+                    config['table_name'] = clean_table_name(table_name)
+                table_name = config['table_name']
                 st.caption(f"Final table name: `{table_name}`")
-                
-                config['table_name'] = table_name
                 config['file_type'] = file_type
                 config['csv_options'] = current_csv_options if file_type in ['csv', 'txt'] else None
+
+                # Sheet selection for Excel files (only the chosen sheet is loaded)
+                if file_type == 'excel':
+                    if 'sheet_names' not in config:
+                        try:
+                            config['sheet_names'] = list_excel_sheets(uploaded_file)
+                        except Exception as e:
+                            logger.warning(f"Could not list sheets for {file_name}: {e}")
+                            config['sheet_names'] = []
+                    if config['sheet_names']:
+                        selected_sheet = st.selectbox(
+                            "Sheet:",
+                            config['sheet_names'],
+                            key=f"sheet_name_{i}",
+                            help="Only the selected sheet is loaded"
+                        )
+                        if config.get('sheet_name') != selected_sheet:
+                            # Force a preview reload for the new sheet
+                            config.pop('original_columns', None)
+                            config.pop('custom_columns', None)
+                            config.pop('custom_columns_clean', None)
+                            config['sheet_name'] = selected_sheet
             
             with col2:
                 st.markdown("**File Details**")
@@ -560,28 +892,44 @@ if uploaded_files:
                 st.caption(f"Type: {file_type.upper()}")
                 st.caption(f"Target: `{selected_db}.{selected_schema}.{table_name}`")
             
+            # Reload the preview when the file bytes or parse options change,
+            # so stale columns never carry into the editor or upload
+            csv_options_items = tuple(sorted(current_csv_options.items())) if file_type in ['csv', 'txt'] else None
+            parse_key = (uploaded_file.size, csv_options_items, config.get('sheet_name'))
+            if config.get('parse_key') != parse_key:
+                config.pop('original_columns', None)
+                config.pop('custom_columns', None)
+                config.pop('custom_columns_clean', None)
+                config['parse_key'] = parse_key
+
             # Automatic preview loading (combined with column editing)
             if 'original_columns' not in config:
                 with st.spinner(f"Loading preview for {file_name}..."):
                     try:
-                        df = read_file_to_dataframe(
-                            uploaded_file, 
-                            file_type, 
-                            current_csv_options if file_type in ['csv', 'txt'] else None
+                        preview = load_preview(
+                            file_digest(uploaded_file),
+                            uploaded_file,
+                            file_type,
+                            csv_options_items,
+                            config.get('sheet_name')
                         )
-                        config['original_columns'] = df.columns.tolist()
-                        config['cleaned_columns'] = [clean_column_name(col) for col in config['original_columns']]
+                        config['original_columns'] = preview['original_columns']
+                        config['cleaned_columns'] = clean_columns(config['original_columns'])
                         if 'custom_columns' not in config:
                             config['custom_columns'] = config['cleaned_columns'].copy()
-                        config['num_rows'] = len(df)
-                        config['preview_head'] = df.head(10)
-                        st.rerun()  # Refresh to show the loaded data
+                            config['custom_columns_clean'] = True
+                        config['num_rows'] = preview['num_rows']
+                        config['num_rows_exact'] = preview['num_rows_exact']
+                        config['preview_head'] = preview['preview_head']
                     except Exception as e:
                         st.error(f"Error loading file: {str(e)}")
             
             # Display preview and editor if loaded
             if 'original_columns' in config:
-                st.success(f"Loaded {config['num_rows']} rows × {len(config['original_columns'])} columns")
+                if config.get('num_rows_exact', True):
+                    st.success(f"Loaded {config['num_rows']} rows × {len(config['original_columns'])} columns")
+                else:
+                    st.success(f"≈ {config['num_rows']:,} rows (estimated) × {len(config['original_columns'])} columns — counted exactly during upload")
                 
                 if config['num_rows'] == 0:
                     st.warning("File appears to be empty")
@@ -612,7 +960,9 @@ if uploaded_files:
                             hide_index=True,
                             use_container_width=True,
                             height=300,
-                            key=f"column_editor_{i}"
+                            key=f"column_editor_{i}",
+                            on_change=_mark_columns_dirty,
+                            kwargs={'file_name': file_name}
                         )
                         # Update custom columns from edits
                         config['custom_columns'] = edited_df['Rename To'].tolist()
@@ -625,76 +975,60 @@ if uploaded_files:
     
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
+        upload_mode = st.radio(
+            "Upload mode",
+            ["Fast (raw COPY)", "Cleaned (pandas)"],
+            index=0,
+            horizontal=True,
+            help="Fast mode stages the original file and lets Snowflake parse it. Files with renamed columns and Excel files always take the pandas path."
+        )
         upload_button = st.button("Upload All Files", type="primary", use_container_width=True)
 
     if upload_button:
         st.markdown('<div class="section-title">Upload Progress</div>', unsafe_allow_html=True)
-        
+
         progress_bar = st.progress(0)
         status_container = st.container()
-        
+
         total_files = len(uploaded_files)
         successful_uploads = 0
-        
-        for i, uploaded_file in enumerate(uploaded_files):
-            file_name = uploaded_file.name
-            
-            if file_name not in st.session_state.file_configs:
+
+        tasks = []
+        for uploaded_file in uploaded_files:
+            if uploaded_file.name not in st.session_state.file_configs:
                 with status_container:
-                    st.error(f"Configuration missing for {file_name}")
+                    st.error(f"Configuration missing for {uploaded_file.name}")
                 continue
-            
-            config = st.session_state.file_configs[file_name]
-            table_name = config['table_name']
-            file_type = config['file_type']
-            # Use selected database and schema instead of session defaults
-            full_table_name = f"{selected_db}.{selected_schema}.{table_name}"
-            
-            with status_container:
-                status_msg = st.empty()
-                status_msg.info(f"Processing {file_name} → {table_name}")
-            
-            try:
-                # Read file into DataFrame
-                df = read_file_to_dataframe(uploaded_file, file_type, config.get('csv_options'))
-                logger.info(f"Read {len(df)} rows from {file_name}")
-                
-                if df.empty:
-                    status_msg.warning(f"Skipped empty file: {file_name}")
-                    continue
-                
-                # Apply custom column names if available, else clean original
-                if 'custom_columns' in config and len(config['custom_columns']) == len(df.columns):
-                    custom_names = config['custom_columns']
-                else:
-                    custom_names = [clean_column_name(col) for col in df.columns]
-                
-                # Clean the (custom) names for Snowflake
-                df.columns = [clean_column_name(col) for col in custom_names]
-                logger.info(f"Applied columns for {file_name}: {df.columns.tolist()}")
-                
-                # Convert to string and handle NaN values
-                df = df.astype(str)
-                df.replace({'<NA>': None, 'nan': None, 'NaN': None, 'None': None}, inplace=True)
-                
-                # Create Snowpark DataFrame and upload to selected database/schema
-                snowpark_df = session.create_dataframe(df)
-                snowpark_df.write.mode("overwrite").option("copy_options", {'on_error': 'continue'}).save_as_table(full_table_name)
-                
-                status_msg.success(f"Successfully uploaded {file_name} to {table_name} ({len(df)} rows)")
-                successful_uploads += 1
-                logger.info(f"Successfully uploaded {file_name} to {full_table_name}")
-                
-            except SnowparkSQLException as e:
-                status_msg.error(f"Snowflake error for {file_name}: {e.message}")
-                logger.error(f"Snowflake error for {file_name}: {e}", exc_info=True)
-            except Exception as e:
-                status_msg.error(f"Error processing {file_name}: {str(e)}")
-                logger.error(f"Error processing {file_name}: {e}", exc_info=True)
-            
-            # Update progress
-            progress_bar.progress((i + 1) / total_files)
-        
+            tasks.append((uploaded_file, st.session_state.file_configs[uploaded_file.name]))
+
+        if tasks:
+            # Run uploads concurrently: the Snowpark round-trips are mostly
+            # network wait and the pandas C parser releases the GIL. Workers
+            # only return results; all rendering happens on the main thread.
+            completed = 0
+            with ThreadPoolExecutor(max_workers=min(4, len(tasks))) as executor:
+                futures = [
+                    executor.submit(
+                        upload_file_raw_copy
+                        if upload_mode.startswith("Fast") and raw_copy_eligible(cfg)
+                        else upload_file_to_table,
+                        session, f, cfg, selected_db, selected_schema
+                    )
+                    for f, cfg in tasks
+                ]
+                for future in as_completed(futures):
+                    status, message = future.result()
+                    completed += 1
+                    with status_container:
+                        if status == 'success':
+                            st.success(message)
+                            successful_uploads += 1
+                        elif status == 'warning':
+                            st.warning(message)
+                        else:
+                            st.error(message)
+                    progress_bar.progress(completed / len(tasks))
+
         # Final status
         if successful_uploads == total_files:
             st.success(f"All {total_files} files uploaded successfully!")